@@ -10,6 +10,15 @@ BUILDING_DEFAULTS = {
     "width_to_length_ratio": 1.0  # Square footprint by default
 }
 
+# Plausible ranges for building parameters that onboarding does not ask for,
+# as (low, mode, high) for triangular sampling and weights for discrete choices
+BUILDING_UNCERTAINTY = {
+    "r_value": (7.0, BUILDING_DEFAULTS["r_value"], 21.0),
+    "ach": (0.5, BUILDING_DEFAULTS["ach"], 2.0),
+    "ceiling_height_ft": (7.5, BUILDING_DEFAULTS["ceiling_height_ft"], 10.0),
+    "floor_weights": {1: 0.5, 2: 0.5}  # Config defaults disagree (1 vs 2 floors)
+}
+
 # Temperature defaults
 TEMPERATURE_DEFAULTS = {
     "heating_setpoint_f": 68,  # °F
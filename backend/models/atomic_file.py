@@ -0,0 +1,35 @@
+import os
+import uuid
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+@contextmanager
+def open_atomic(path: str, mode: str = "w") -> Iterator[IO]:
+    """
+    Open a file for writing that replaces path only once fully written.
+
+    Data goes to a uniquely named temporary file in the same directory, which
+    is flushed to disk and renamed over path on success, so readers (and
+    other writers) never see a partial file. The temporary file is created
+    with the same permissions as open() would use, honoring the umask.
+
+    Args:
+        path: File to write
+        mode: "w" for text or "wb" for binary
+    """
+    tmp_path = os.path.join(
+        os.path.dirname(path) or ".", f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp"
+    )
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
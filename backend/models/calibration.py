@@ -0,0 +1,215 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from config import TEMPERATURE_DEFAULTS
+from config.debug_config import debug_print, DebugLevel
+from .energy_model import Building, HeatingSystem, CoolingSystem, calculate_energy_per_btu
+from .weather import DEFAULT_WEATHER_YEAR, load_hourly_weather
+
+@dataclass
+class UtilityAccount:
+    zip_code: str
+    square_footage: float
+    heating_system: Optional[HeatingSystem]
+    cooling_system: Optional[CoolingSystem]
+    monthly_kwh: Sequence[float]  # 12 calendar-month totals, January first
+    monthly_therm: Sequence[float]  # 12 calendar-month totals, January first
+
+@dataclass
+class CalibrationResult:
+    building: Building
+    load_coefficient: float  # Fitted UA (BTU/h per °F)
+    base_kwh_per_hour: float  # Weather-independent electricity use
+    base_therm_per_hour: float  # Weather-independent gas use
+    rmse_kwh: float  # Monthly fit error
+    rmse_therm: float
+
+def calculate_monthly_degree_hours(
+    hourly_weather: pd.DataFrame,
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aggregate an hourly weather series into calendar-month degree-hours.
+
+    Args:
+        hourly_weather: DataFrame with datetime and temperature columns
+        indoor_temp_heat: Indoor heating setpoint (°F)
+        indoor_temp_cool: Indoor cooling setpoint (°F)
+
+    Returns:
+        tuple of (heating_degree_hours, cooling_degree_hours, hours), each of length 12
+    """
+    temps = hourly_weather["temperature"].to_numpy(dtype=float)
+    months = hourly_weather["datetime"].dt.month.to_numpy() - 1
+
+    heating = np.bincount(months, weights=np.clip(indoor_temp_heat - temps, 0, None), minlength=12)
+    cooling = np.bincount(months, weights=np.clip(temps - indoor_temp_cool, 0, None), minlength=12)
+    hours = np.bincount(months, minlength=12).astype(float)
+    return heating, cooling, hours
+
+def fit_load_coefficients(
+    heating_degree_hours: np.ndarray,
+    cooling_degree_hours: np.ndarray,
+    hours: np.ndarray,
+    monthly_kwh: np.ndarray,
+    monthly_therm: np.ndarray,
+    kwh_per_btu: np.ndarray,
+    therm_per_btu: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Fit load coefficients and base loads for a batch of accounts.
+
+    For each account and month m the model is
+
+        kwh_m   = UA * (HDH_m * kwh_heat + CDH_m * kwh_cool) + base_kwh * hours_m
+        therm_m = UA * HDH_m * therm_heat + base_therm * hours_m
+
+    which is linear in (UA, base_kwh, base_therm). Both fuels are stacked
+    into one weighted least-squares problem per account (rows scaled by the
+    account's mean bill so kWh and therms count equally) and all accounts
+    are solved together with a batched pseudo-inverse.
+
+    Args:
+        heating_degree_hours: (n, 12) monthly heating degree-hours
+        cooling_degree_hours: (n, 12) monthly cooling degree-hours
+        hours: (n, 12) hours in each month
+        monthly_kwh: (n, 12) electricity bills
+        monthly_therm: (n, 12) gas bills
+        kwh_per_btu: (n, 2) electricity per BTU of heating and cooling load
+        therm_per_btu: (n,) gas per BTU of heating load
+
+    Returns:
+        Dictionary of (n,) arrays: load_coefficient, base_kwh_per_hour,
+        base_therm_per_hour, rmse_kwh and rmse_therm.
+    """
+    n_accounts = monthly_kwh.shape[0]
+    zeros = np.zeros_like(hours)
+
+    kwh_load = heating_degree_hours * kwh_per_btu[:, :1] + cooling_degree_hours * kwh_per_btu[:, 1:]
+    therm_load = heating_degree_hours * therm_per_btu[:, None]
+    design = np.concatenate([
+        np.stack([kwh_load, hours, zeros], axis=2),
+        np.stack([therm_load, zeros, hours], axis=2),
+    ], axis=1)
+    bills = np.concatenate([monthly_kwh, monthly_therm], axis=1)
+
+    kwh_scale = monthly_kwh.mean(axis=1)
+    therm_scale = monthly_therm.mean(axis=1)
+    weights = np.concatenate([
+        np.repeat(1 / np.where(kwh_scale > 0, kwh_scale, 1.0)[:, None], 12, axis=1),
+        np.repeat(1 / np.where(therm_scale > 0, therm_scale, 1.0)[:, None], 12, axis=1),
+    ], axis=1)
+
+    # Normalize columns so the pseudo-inverse cutoff treats all unknowns alike
+    weighted = design * weights[:, :, None]
+    column_norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    column_norms[column_norms == 0] = 1.0
+    solution = np.einsum(
+        "nij,nj->ni",
+        np.linalg.pinv(weighted / column_norms),
+        bills * weights
+    ) / column_norms[:, 0, :]
+    residuals = np.einsum("nij,nj->ni", design, solution) - bills
+
+    debug_print(f"Calibrated {n_accounts} accounts", DebugLevel.DEBUG, "energy")
+    return {
+        "load_coefficient": solution[:, 0],
+        "base_kwh_per_hour": solution[:, 1],
+        "base_therm_per_hour": solution[:, 2],
+        "rmse_kwh": np.sqrt(np.mean(residuals[:, :12] ** 2, axis=1)),
+        "rmse_therm": np.sqrt(np.mean(residuals[:, 12:] ** 2, axis=1)),
+    }
+
+def building_from_load_coefficient(square_footage: float, load_coefficient: float) -> Building:
+    """
+    Create a Building whose load coefficient matches a fitted UA.
+
+    Bills only identify the total UA, so conduction and infiltration are
+    scaled by the same factor relative to the default building.
+    """
+    default = Building(square_footage=square_footage)
+    scale = load_coefficient / default.load_coefficient
+    return Building(
+        square_footage=square_footage,
+        r_value=default.r_value / scale,
+        ach=default.ach * scale
+    )
+
+def calibrate_accounts(
+    accounts: List[UtilityAccount],
+    year: int = DEFAULT_WEATHER_YEAR,
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"],
+    data_dir: Optional[str] = None
+) -> List[Optional[CalibrationResult]]:
+    """
+    Calibrate buildings for a batch of utility accounts from their monthly bills.
+
+    Weather is loaded once per ZIP code and all accounts are fitted in a
+    single batched solve.
+
+    Args:
+        accounts: Utility accounts with 12 monthly kWh and therm totals
+        year: Year of the stored weather data the bills cover
+        indoor_temp_heat: Indoor heating setpoint (°F)
+        indoor_temp_cool: Indoor cooling setpoint (°F)
+        data_dir: Optional directory containing the weather CSV files
+
+    Returns:
+        Calibration result per account, in input order. None where the bills
+        are not 12 monthly totals, no weather data is stored for the ZIP or
+        the bills show no weather-driven load.
+    """
+    degree_hours = {}
+    for zip_code in {account.zip_code for account in accounts}:
+        hourly_weather = load_hourly_weather(zip_code, year, data_dir)
+        if hourly_weather is not None:
+            degree_hours[zip_code] = calculate_monthly_degree_hours(
+                hourly_weather, indoor_temp_heat, indoor_temp_cool
+            )
+
+    fitted_indices = []
+    for i, account in enumerate(accounts):
+        if len(account.monthly_kwh) != 12 or len(account.monthly_therm) != 12:
+            debug_print(f"Expected 12 monthly bills for ZIP {account.zip_code}", DebugLevel.ERROR, "energy")
+        elif account.zip_code in degree_hours:
+            fitted_indices.append(i)
+    fitted = [accounts[i] for i in fitted_indices]
+    results: List[Optional[CalibrationResult]] = [None] * len(accounts)
+    if fitted:
+        heating, cooling, hours = (
+            np.array([degree_hours[account.zip_code][i] for account in fitted]) for i in range(3)
+        )
+        kwh_per_btu = np.array([
+            [calculate_energy_per_btu(a.heating_system, a.cooling_system, mode)["energy_consumption_kwh"]
+             for mode in ("heating", "cooling")]
+            for a in fitted
+        ])
+        therm_per_btu = np.array([
+            calculate_energy_per_btu(a.heating_system, a.cooling_system, "heating")["gas_consumption_therm"]
+            for a in fitted
+        ])
+        fit = fit_load_coefficients(
+            heating, cooling, hours,
+            np.array([a.monthly_kwh for a in fitted], dtype=float),
+            np.array([a.monthly_therm for a in fitted], dtype=float),
+            kwh_per_btu, therm_per_btu
+        )
+
+        for i, (index, account) in enumerate(zip(fitted_indices, fitted)):
+            load_coefficient = float(fit["load_coefficient"][i])
+            if load_coefficient <= 0:
+                debug_print(f"No weather-driven load in bills for ZIP {account.zip_code}", DebugLevel.ERROR, "energy")
+                continue
+            results[index] = CalibrationResult(
+                building=building_from_load_coefficient(account.square_footage, load_coefficient),
+                load_coefficient=load_coefficient,
+                base_kwh_per_hour=float(fit["base_kwh_per_hour"][i]),
+                base_therm_per_hour=float(fit["base_therm_per_hour"][i]),
+                rmse_kwh=float(fit["rmse_kwh"][i]),
+                rmse_therm=float(fit["rmse_therm"][i])
+            )
+
+    return results
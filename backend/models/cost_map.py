@@ -0,0 +1,208 @@
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+from config import TEMPERATURE_DEFAULTS
+from config.debug_config import debug_print, DebugLevel
+from .atomic_file import open_atomic
+from .energy_model import Building, HeatingSystem, CoolingSystem, calculate_annual_energy
+from .result_cache import get_config_version
+from .weather import DEFAULT_WEATHER_YEAR, list_weather_zip_codes, load_hourly_temperatures, get_weather_version
+
+# Constants
+COST_MAP_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data/cost_map.bin")
+COST_MAP_MAGIC = b"PHCOSTMAP1\n"
+ARCHETYPE_SQUARE_FOOTAGES = [1000, 1500, 2000, 2500, 3000]
+ARCHETYPE_SYSTEMS = [
+    (HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC),
+    (HeatingSystem.GAS_FURNACE, CoolingSystem.NONE),
+    (HeatingSystem.ELECTRIC_RESISTANCE, CoolingSystem.CENTRAL_AC),
+    (HeatingSystem.ELECTRIC_RESISTANCE, CoolingSystem.NONE),
+]
+COST_COLUMNS = ["heating_cost", "cooling_cost"]
+
+@dataclass(frozen=True)
+class HomeArchetype:
+    square_footage: float
+    heating_system: HeatingSystem
+    cooling_system: CoolingSystem
+
+    @property
+    def key(self) -> str:
+        return f"{self.square_footage:g}|{self.heating_system.value}|{self.cooling_system.value}"
+
+def default_archetypes() -> List[HomeArchetype]:
+    """Grid of default homes precomputed for every ZIP code"""
+    return [
+        HomeArchetype(square_footage, heating_system, cooling_system)
+        for square_footage in ARCHETYPE_SQUARE_FOOTAGES
+        for heating_system, cooling_system in ARCHETYPE_SYSTEMS
+    ]
+
+class CostMap:
+    """
+    Read-only ZIP-level cost map.
+
+    The file is a JSON header (ZIP codes, archetype keys and the versions
+    they were built from) followed by a little-endian float32 matrix of shape
+    (zip codes, archetypes, cost columns) that is memory-mapped, so a lookup
+    is two dictionary probes and one array read.
+    """
+
+    def __init__(self, path: str = COST_MAP_FILE):
+        with open(path, "rb") as f:
+            if f.read(len(COST_MAP_MAGIC)) != COST_MAP_MAGIC:
+                raise ValueError(f"Not a cost map file: {path}")
+            (header_length,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(header_length))
+        data_offset = len(COST_MAP_MAGIC) + 4 + header_length
+
+        self.path = path
+        self.zip_codes: List[str] = self.header["zip_codes"]
+        self.archetype_keys: List[str] = self.header["archetypes"]
+        self._zip_index = {zip_code: i for i, zip_code in enumerate(self.zip_codes)}
+        self._archetype_index = {key: i for i, key in enumerate(self.archetype_keys)}
+        self._square_footages = sorted({float(key.split("|")[0]) for key in self.archetype_keys})
+        self.costs = np.memmap(
+            path, dtype="<f4", mode="r",
+            offset=data_offset,
+            shape=(len(self.zip_codes), len(self.archetype_keys), len(COST_COLUMNS))
+        ) if self.zip_codes else np.zeros((0, len(self.archetype_keys), len(COST_COLUMNS)), dtype="<f4")
+
+    def __contains__(self, zip_code: str) -> bool:
+        return zip_code in self._zip_index
+
+    def __len__(self) -> int:
+        return len(self.zip_codes)
+
+    def lookup(
+        self,
+        zip_code: str,
+        square_footage: float = 2000,
+        heating_system: Optional[HeatingSystem] = HeatingSystem.GAS_FURNACE,
+        cooling_system: Optional[CoolingSystem] = CoolingSystem.CENTRAL_AC
+    ) -> Optional[Dict[str, float]]:
+        """
+        Look up the typical annual cost for a home in a ZIP code.
+
+        Square footage is snapped to the nearest archetype size. Systems are
+        taken as returned by create_building_from_onboarding(): no cooling
+        system means CoolingSystem.NONE, and no (or an unknown) heating
+        system has no archetype.
+
+        Returns:
+            Dictionary with heating_cost, cooling_cost and total_cost, or None
+            if the ZIP code or system combination is not in the map.
+        """
+        zip_row = self._zip_index.get(zip_code)
+        if zip_row is None or heating_system is None or not self._square_footages:
+            return None
+        if cooling_system is None:
+            cooling_system = CoolingSystem.NONE
+
+        nearest = min(self._square_footages, key=lambda s: abs(s - square_footage))
+        archetype = HomeArchetype(nearest, heating_system, cooling_system)
+        archetype_column = self._archetype_index.get(archetype.key)
+        if archetype_column is None:
+            return None
+
+        heating_cost, cooling_cost = (float(cost) for cost in self.costs[zip_row, archetype_column])
+        return {
+            "heating_cost": heating_cost,
+            "cooling_cost": cooling_cost,
+            "total_cost": heating_cost + cooling_cost
+        }
+
+def _write_cost_map(path: str, header: Dict, costs: np.ndarray) -> None:
+    """Write a cost map atomically so readers never see a partial file"""
+    header_bytes = json.dumps(header).encode()
+    # Pad with whitespace so the float32 data starts 4-byte aligned
+    header_bytes += b" " * (-(len(COST_MAP_MAGIC) + 4 + len(header_bytes)) % 4)
+
+    with open_atomic(path, "wb") as f:
+        f.write(COST_MAP_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(np.ascontiguousarray(costs, dtype="<f4").tobytes())
+
+def build_cost_map(
+    path: str = COST_MAP_FILE,
+    year: int = DEFAULT_WEATHER_YEAR,
+    archetypes: Optional[List[HomeArchetype]] = None,
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"],
+    data_dir: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Build or incrementally rebuild the ZIP-level cost map from the weather store.
+
+    Rows from an existing map are reused for ZIP codes whose weather has not
+    changed. A change to the equipment/tariff config, archetype grid or
+    setpoints rebuilds every ZIP code.
+
+    Args:
+        path: Cost map file to write
+        year: Year of the stored weather data
+        archetypes: Homes to precompute, defaults to default_archetypes()
+        indoor_temp_heat: Indoor heating setpoint (°F)
+        indoor_temp_cool: Indoor cooling setpoint (°F)
+        data_dir: Optional directory containing the weather CSV files
+
+    Returns:
+        Counts of rebuilt, reused and removed ZIP codes.
+    """
+    archetypes = archetypes or default_archetypes()
+    header = {
+        "config_version": get_config_version(),
+        "year": year,
+        "setpoints": [float(indoor_temp_heat), float(indoor_temp_cool)],
+        "archetypes": [archetype.key for archetype in archetypes],
+        "cost_columns": COST_COLUMNS,
+    }
+
+    previous = None
+    if os.path.exists(path):
+        try:
+            previous = CostMap(path)
+        except (ValueError, KeyError, json.JSONDecodeError) as e:
+            debug_print(f"Ignoring unreadable cost map: {str(e)}", DebugLevel.ERROR, "costs")
+        if previous is not None and any(previous.header.get(name) != value for name, value in header.items()):
+            debug_print("Cost map config changed, rebuilding all ZIP codes", DebugLevel.INFO, "costs")
+            previous = None
+
+    zip_codes = list_weather_zip_codes(year, data_dir)
+    weather_versions = {zip_code: get_weather_version(zip_code, year, data_dir) for zip_code in zip_codes}
+    costs = np.zeros((len(zip_codes), len(archetypes), len(COST_COLUMNS)), dtype="<f4")
+    counts = {"rebuilt": 0, "reused": 0, "removed": 0}
+
+    for row, zip_code in enumerate(zip_codes):
+        if previous is not None and previous.header["weather_versions"].get(zip_code) == weather_versions[zip_code]:
+            costs[row] = previous.costs[previous._zip_index[zip_code]]
+            counts["reused"] += 1
+            continue
+
+        hourly_temps = load_hourly_temperatures(zip_code, year, data_dir)
+        for column, archetype in enumerate(archetypes):
+            results = calculate_annual_energy(
+                Building(square_footage=archetype.square_footage),
+                archetype.heating_system, archetype.cooling_system, hourly_temps,
+                indoor_temp_heat, indoor_temp_cool
+            )
+            costs[row, column] = [results[name] for name in COST_COLUMNS]
+        counts["rebuilt"] += 1
+
+    if previous is not None:
+        counts["removed"] = len(set(previous.zip_codes) - set(zip_codes))
+        del previous  # Release the memory map before replacing the file
+
+    header["zip_codes"] = zip_codes
+    header["weather_versions"] = weather_versions
+    _write_cost_map(path, header, costs)
+
+    debug_print(
+        f"Cost map: rebuilt {counts['rebuilt']}, reused {counts['reused']}, removed {counts['removed']} ZIP codes",
+        DebugLevel.INFO, "costs"
+    )
+    return counts
@@ -1,7 +1,7 @@
 import math
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Sequence
 from config import (
     BUILDING_DEFAULTS,
     TEMPERATURE_DEFAULTS,
@@ -54,6 +54,12 @@ class Building:
         # Surface area = 2(lw + lh + wh)
         return 2 * (length * width + length * height + width * height)
 
+    @property
+    def load_coefficient(self) -> float:
+        """Calculate total heat loss coefficient (UA) in BTU/h per °F
+        Conductive plus infiltration load for a 1°F temperature difference"""
+        return self.surface_area / self.r_value + 1.08 * self.ach * self.volume
+
 def calculate_load(building: Building, indoor_temp: float, outdoor_temp: float) -> tuple[float, float]:
     """
     Calculate heating/cooling load in BTU/h
@@ -84,40 +90,25 @@ def calculate_load(building: Building, indoor_temp: float, outdoor_temp: float)
     
     return conductive_load, infiltration_load
 
-def calculate_energy_consumption(
-    building: Building,
+def convert_load_to_energy(
+    total_load: float,
     heating_system: Optional[HeatingSystem],
     cooling_system: Optional[CoolingSystem],
-    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
-    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"],
-    outdoor_temp: float = 0,
     mode: str = "heating"
 ) -> dict:
     """
-    Calculate energy consumption for heating or cooling
+    Convert a heating or cooling load into energy consumption and cost
     
     Args:
-        building: Building object
+        total_load: Load delivered by the equipment (BTU)
         heating_system: Type of heating system
         cooling_system: Type of cooling system
-        indoor_temp_heat: Indoor heating setpoint (°F)
-        indoor_temp_cool: Indoor cooling setpoint (°F)
-        outdoor_temp: Outdoor temperature (°F)
         mode: "heating" or "cooling"
         
     Returns:
-        Dictionary with load and energy consumption details
+        Dictionary with energy consumption and cost details
     """
-    debug_print(f"Calculating {mode} energy for {outdoor_temp}°F", DebugLevel.INFO, "energy")
-    
-    indoor_temp = indoor_temp_heat if mode == "heating" else indoor_temp_cool
-    conductive_load, infiltration_load = calculate_load(building, indoor_temp, outdoor_temp)
-    total_load = abs(conductive_load + infiltration_load)
-    
     results = {
-        "conductive_load_btuh": conductive_load,
-        "infiltration_load_btuh": infiltration_load,
-        "total_load_btuh": total_load,
         "energy_consumption_kwh": 0,
         "gas_consumption_therm": 0,
         "energy_cost": 0
@@ -144,6 +135,62 @@ def calculate_energy_consumption(
         results["energy_consumption_kwh"] = total_load / (eer * 3.412)  # Convert EER to BTU/Wh
         results["energy_cost"] = calculate_energy_cost("electric", results["energy_consumption_kwh"], "kwh")
     
+    return results
+
+def calculate_energy_per_btu(
+    heating_system: Optional[HeatingSystem],
+    cooling_system: Optional[CoolingSystem],
+    mode: str = "heating"
+) -> dict:
+    """
+    Energy consumption and cost for delivering 1 BTU of heating or cooling load
+    
+    convert_load_to_energy() is linear in load, so these rates can be
+    multiplied by any load (or array of loads) to get consumption and cost.
+    
+    Returns:
+        Dictionary with energy_consumption_kwh, gas_consumption_therm and energy_cost per BTU
+    """
+    return convert_load_to_energy(1.0, heating_system, cooling_system, mode)
+
+def calculate_energy_consumption(
+    building: Building,
+    heating_system: Optional[HeatingSystem],
+    cooling_system: Optional[CoolingSystem],
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"],
+    outdoor_temp: float = 0,
+    mode: str = "heating"
+) -> dict:
+    """
+    Calculate energy consumption for heating or cooling
+    
+    Args:
+        building: Building object
+        heating_system: Type of heating system
+        cooling_system: Type of cooling system
+        indoor_temp_heat: Indoor heating setpoint (°F)
+        indoor_temp_cool: Indoor cooling setpoint (°F)
+        outdoor_temp: Outdoor temperature (°F)
+        mode: "heating" or "cooling"
+        
+    Returns:
+        Dictionary with load and energy consumption details
+    """
+    debug_print(f"Calculating {mode} energy for {outdoor_temp}°F", DebugLevel.INFO, "energy")
+    
+    indoor_temp = indoor_temp_heat if mode == "heating" else indoor_temp_cool
+    conductive_load, infiltration_load = calculate_load(building, indoor_temp, outdoor_temp)
+    total_load = abs(conductive_load + infiltration_load)
+    
+    results = {
+        "conductive_load_btuh": conductive_load,
+        "infiltration_load_btuh": infiltration_load,
+        "total_load_btuh": total_load
+    }
+    
+    results.update(convert_load_to_energy(total_load, heating_system, cooling_system, mode))
+    
     debug_json({
         "mode": mode,
         "outdoor_temp": outdoor_temp,
@@ -152,6 +199,78 @@ def calculate_energy_consumption(
     
     return results
 
+def calculate_degree_hours(
+    hourly_temps: Sequence[float],
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"]
+) -> tuple[float, float]:
+    """
+    Calculate heating and cooling degree-hours for an hourly temperature series
+    
+    Args:
+        hourly_temps: Outdoor temperatures (°F), one per hour
+        indoor_temp_heat: Indoor heating setpoint (°F)
+        indoor_temp_cool: Indoor cooling setpoint (°F)
+        
+    Returns:
+        tuple of (heating_degree_hours, cooling_degree_hours) in °F·h
+    """
+    heating_degree_hours = sum(indoor_temp_heat - t for t in hourly_temps if t < indoor_temp_heat)
+    cooling_degree_hours = sum(t - indoor_temp_cool for t in hourly_temps if t > indoor_temp_cool)
+    return heating_degree_hours, cooling_degree_hours
+
+def calculate_annual_energy(
+    building: Building,
+    heating_system: Optional[HeatingSystem],
+    cooling_system: Optional[CoolingSystem],
+    hourly_temps: Sequence[float],
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"]
+) -> dict:
+    """
+    Calculate annual heating and cooling energy over an hourly weather series
+    
+    Heating runs in hours below the heating setpoint and cooling in hours above
+    the cooling setpoint. Because the load is linear in ΔT, the annual load is
+    the building's load coefficient times the degree-hours for each mode.
+    
+    Args:
+        building: Building object
+        heating_system: Type of heating system
+        cooling_system: Type of cooling system
+        hourly_temps: Outdoor temperatures (°F), one per hour
+        indoor_temp_heat: Indoor heating setpoint (°F)
+        indoor_temp_cool: Indoor cooling setpoint (°F)
+        
+    Returns:
+        Dictionary with annual load, consumption and cost details
+    """
+    heating_degree_hours, cooling_degree_hours = calculate_degree_hours(
+        hourly_temps, indoor_temp_heat, indoor_temp_cool
+    )
+    heating_load = building.load_coefficient * heating_degree_hours
+    cooling_load = building.load_coefficient * cooling_degree_hours
+    
+    heating = convert_load_to_energy(heating_load, heating_system, cooling_system, "heating")
+    cooling = convert_load_to_energy(cooling_load, heating_system, cooling_system, "cooling")
+    
+    results = {
+        "heating_degree_hours": heating_degree_hours,
+        "cooling_degree_hours": cooling_degree_hours,
+        "heating_load_btu": heating_load,
+        "cooling_load_btu": cooling_load,
+        "heating_kwh": heating["energy_consumption_kwh"],
+        "heating_therm": heating["gas_consumption_therm"],
+        "cooling_kwh": cooling["energy_consumption_kwh"],
+        "heating_cost": heating["energy_cost"],
+        "cooling_cost": cooling["energy_cost"],
+        "total_cost": heating["energy_cost"] + cooling["energy_cost"]
+    }
+    
+    debug_json(results, DebugLevel.DEBUG, "costs")
+    
+    return results
+
 def create_building_from_onboarding(
     square_footage: float,
     primary_heating: str,
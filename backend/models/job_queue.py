@@ -0,0 +1,370 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+from config.debug_config import debug_print, DebugLevel
+from .atomic_file import open_atomic
+from .energy_model import create_building_from_onboarding, calculate_annual_energy
+from .weather import DEFAULT_WEATHER_YEAR, load_hourly_temperatures
+
+# Constants
+DEFAULT_HOMES_PER_SHARD = 500
+DEFAULT_STALE_AFTER_S = 300  # Claims without a heartbeat for this long are re-queued
+DEFAULT_POLL_INTERVAL_S = 1.0
+MANIFEST_FILE = "manifest.json"
+SUMMARY_FILE = "summary.json"
+PENDING_DIR = "pending"
+CLAIMED_DIR = "claimed"
+RESULTS_DIR = "results"
+CLAIM_SEPARATOR = "@"
+
+@dataclass
+class PortfolioHome:
+    home_id: str
+    zip_code: str
+    square_footage: float
+    primary_heating: str
+    primary_cooling: str
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON via a temporary file and rename so readers never see a partial file"""
+    with open_atomic(path) as f:
+        json.dump(data, f)
+
+def _read_json(path: str) -> Any:
+    with open(path) as f:
+        return json.load(f)
+
+def _result_path(queue_dir: str, shard_name: str, run_id: str) -> str:
+    """
+    Get the result file of a shard.
+
+    The run id is part of the name, so a worker still finishing a shard from
+    an earlier run in the same queue directory cannot overwrite this run's
+    result.
+    """
+    return os.path.join(queue_dir, RESULTS_DIR, f"{shard_name}.{run_id}.json")
+
+def _read_result(queue_dir: str, shard_name: str, run_id: str) -> Optional[Dict[str, Any]]:
+    """Read a shard's result for a run, or None if it is missing or unreadable"""
+    try:
+        return _read_json(_result_path(queue_dir, shard_name, run_id))
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        debug_print(f"Ignoring unreadable result for shard {shard_name}: {str(e)}", DebugLevel.ERROR, "costs")
+        return None
+
+def create_shards(
+    homes: List[PortfolioHome],
+    queue_dir: str,
+    homes_per_shard: int = DEFAULT_HOMES_PER_SHARD,
+    overwrite: bool = False
+) -> List[str]:
+    """
+    Split a portfolio into shard manifests keyed by ZIP code.
+
+    Homes in the same ZIP share weather data, so each shard holds homes from
+    a single ZIP code, split further when a ZIP has more than homes_per_shard.
+    Each call starts a new run with its own id, recorded in the manifest,
+    every shard and every result file.
+
+    Args:
+        homes: Homes to score
+        queue_dir: Shared directory visible to every worker
+        homes_per_shard: Maximum number of homes per shard
+        overwrite: Delete an earlier run in queue_dir instead of refusing it
+
+    Returns:
+        Names of the created shards.
+    """
+    if homes_per_shard < 1:
+        raise ValueError(f"homes_per_shard must be positive, got {homes_per_shard}")
+
+    queue_files = [os.path.join(queue_dir, name) for name in (MANIFEST_FILE, SUMMARY_FILE)]
+    queue_dirs = [os.path.join(queue_dir, name) for name in (PENDING_DIR, CLAIMED_DIR, RESULTS_DIR)]
+    in_use = any(os.path.exists(path) for path in queue_files) or any(
+        os.path.isdir(path) and os.listdir(path) for path in queue_dirs
+    )
+    if in_use and not overwrite:
+        raise ValueError(f"Queue directory already holds a run: {queue_dir}")
+    for path in queue_files:
+        if os.path.exists(path):
+            os.remove(path)
+    for path in queue_dirs:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+    run_id = uuid.uuid4().hex
+
+    by_zip: Dict[str, List[PortfolioHome]] = {}
+    for home in homes:
+        by_zip.setdefault(home.zip_code, []).append(home)
+
+    shard_homes: Dict[str, List[str]] = {}
+    for zip_code in sorted(by_zip):
+        zip_homes = by_zip[zip_code]
+        for part, start in enumerate(range(0, len(zip_homes), homes_per_shard)):
+            shard_name = f"{zip_code}_{part:04d}"
+            _write_json_atomic(os.path.join(queue_dir, PENDING_DIR, f"{shard_name}.json"), {
+                "run_id": run_id,
+                "shard": shard_name,
+                "zip_code": zip_code,
+                "homes": [asdict(home) for home in zip_homes[start:start + homes_per_shard]]
+            })
+            shard_homes[shard_name] = [home.home_id for home in zip_homes[start:start + homes_per_shard]]
+    shard_names = list(shard_homes)
+
+    # The manifest is written last so merge_results() knows the full shard set
+    _write_json_atomic(os.path.join(queue_dir, MANIFEST_FILE), {
+        "run_id": run_id,
+        "shards": shard_names,
+        "shard_homes": shard_homes,
+        "n_homes": len(homes)
+    })
+    debug_print(f"Created {len(shard_names)} shards for {len(homes)} homes", DebugLevel.INFO, "costs")
+    return shard_names
+
+def _shard_from_claim(filename: str) -> str:
+    """Get the shard name from a claim file name"""
+    return filename.split(CLAIM_SEPARATOR)[0]
+
+def _filesystem_now(queue_dir: str) -> float:
+    """
+    Current time according to the queue's filesystem.
+
+    Heartbeats are file mtimes set by the (possibly shared) filesystem, so
+    staleness is measured against a freshly touched file on the same
+    filesystem rather than this node's clock.
+    """
+    with tempfile.NamedTemporaryFile(dir=queue_dir, prefix=".clock-") as f:
+        return os.fstat(f.fileno()).st_mtime
+
+def claim_shard(queue_dir: str, worker_id: str) -> Optional[str]:
+    """
+    Atomically claim the next pending shard.
+
+    A claim is a rename from pending/ to claimed/ with the worker id in the
+    file name. Rename is atomic on a single filesystem, so when several
+    workers race for the same shard exactly one succeeds. The pending file
+    is touched first, since rename keeps its modification time and that
+    time is the claim's heartbeat.
+
+    Returns:
+        Path of the claimed shard file, or None if no shards are pending.
+    """
+    pending_dir = os.path.join(queue_dir, PENDING_DIR)
+    for filename in sorted(os.listdir(pending_dir)):
+        if not filename.endswith(".json"):
+            continue
+        shard_name = filename[:-len(".json")]
+        claim_name = CLAIM_SEPARATOR.join([shard_name, worker_id, str(time.time_ns())]) + ".json"
+        claim_path = os.path.join(queue_dir, CLAIMED_DIR, claim_name)
+        pending_path = os.path.join(pending_dir, filename)
+        try:
+            os.utime(pending_path)
+            os.rename(pending_path, claim_path)
+        except FileNotFoundError:
+            continue  # Another worker claimed it first
+        debug_print(f"Worker {worker_id} claimed shard {shard_name}", DebugLevel.DEBUG, "costs")
+        return claim_path
+    return None
+
+def reclaim_stale_shards(queue_dir: str, stale_after_s: float = DEFAULT_STALE_AFTER_S) -> List[str]:
+    """
+    Return shards whose worker stopped sending heartbeats to the pending queue.
+
+    Workers refresh the claim file's modification time as they make progress.
+    Only modification times set by the filesystem are compared, so node
+    clocks do not need to be in sync. Claims whose shard already has a
+    readable result for the claim's run are simply removed; an unreadable
+    result counts as missing, so the shard is run again.
+
+    Returns:
+        Names of the re-queued shards.
+    """
+    claimed_dir = os.path.join(queue_dir, CLAIMED_DIR)
+    now = _filesystem_now(queue_dir)
+    reclaimed = []
+    for filename in sorted(os.listdir(claimed_dir)):
+        if not filename.endswith(".json"):
+            continue
+        claim_path = os.path.join(claimed_dir, filename)
+        shard_name = _shard_from_claim(filename)
+        try:
+            run_id = _read_json(claim_path)["run_id"]
+            if _read_result(queue_dir, shard_name, run_id) is not None:
+                os.remove(claim_path)
+                continue
+            if now - os.path.getmtime(claim_path) < stale_after_s:
+                continue
+            os.rename(claim_path, os.path.join(queue_dir, PENDING_DIR, f"{shard_name}.json"))
+        except FileNotFoundError:
+            continue  # Finished or reclaimed by another worker meanwhile
+        except (ValueError, KeyError) as e:
+            debug_print(f"Skipping unreadable claim {filename}: {str(e)}", DebugLevel.ERROR, "costs")
+            continue
+        reclaimed.append(shard_name)
+        debug_print(f"Re-queued stale shard {shard_name}", DebugLevel.INFO, "costs")
+    return reclaimed
+
+def run_shard(
+    shard: Dict[str, Any],
+    claim_path: Optional[str] = None,
+    year: int = DEFAULT_WEATHER_YEAR,
+    data_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run the energy model for every home in a shard.
+
+    Weather is loaded once per shard, since all homes share a ZIP code. When
+    claim_path is given it is touched after each home as a heartbeat.
+
+    Returns:
+        Per-home results with costs, or an error message for homes that
+        could not be scored.
+    """
+    hourly_temps = load_hourly_temperatures(shard["zip_code"], year, data_dir)
+    results = []
+    for home in shard["homes"]:
+        result = {"home_id": home["home_id"], "zip_code": home["zip_code"]}
+        if hourly_temps is None:
+            result["error"] = f"No weather data for ZIP {home['zip_code']}"
+        else:
+            building, heating_system, cooling_system = create_building_from_onboarding(
+                home["square_footage"], home["primary_heating"], home["primary_cooling"]
+            )
+            annual = calculate_annual_energy(building, heating_system, cooling_system, hourly_temps)
+            result.update({name: annual[name] for name in ("heating_cost", "cooling_cost", "total_cost")})
+        results.append(result)
+
+        if claim_path:
+            try:
+                os.utime(claim_path)
+            except FileNotFoundError:
+                pass  # Re-queued as stale; finish anyway, results are idempotent
+    return results
+
+def run_worker(
+    queue_dir: str,
+    worker_id: Optional[str] = None,
+    stale_after_s: float = DEFAULT_STALE_AFTER_S,
+    poll_interval_s: float = DEFAULT_POLL_INTERVAL_S,
+    year: int = DEFAULT_WEATHER_YEAR,
+    data_dir: Optional[str] = None
+) -> int:
+    """
+    Claim and run shards until the queue is drained.
+
+    While other workers still hold claims the worker keeps polling, so it can
+    pick up shards that go stale if one of them crashes.
+
+    Args:
+        queue_dir: Shared queue directory created by create_shards()
+        worker_id: Unique worker name, defaults to hostname and process id
+        stale_after_s: Heartbeat age after which a claim is re-queued
+        poll_interval_s: Sleep between polls while other workers hold claims
+        year: Year of the stored weather data
+        data_dir: Optional directory containing the weather CSV files
+
+    Returns:
+        Number of shards this worker completed.
+    """
+    worker_id = (worker_id or f"{socket.gethostname()}-{os.getpid()}").replace(CLAIM_SEPARATOR, "-")
+    completed = 0
+    while True:
+        reclaim_stale_shards(queue_dir, stale_after_s)
+        claim_path = claim_shard(queue_dir, worker_id)
+        if claim_path is None:
+            if not any(name.endswith(".json") for name in os.listdir(os.path.join(queue_dir, CLAIMED_DIR))):
+                break
+            time.sleep(poll_interval_s)
+            continue
+
+        shard = _read_json(claim_path)
+        results = run_shard(shard, claim_path, year, data_dir)
+        _write_json_atomic(
+            _result_path(queue_dir, shard["shard"], shard["run_id"]),
+            {"run_id": shard["run_id"], "shard": shard["shard"], "worker_id": worker_id, "results": results}
+        )
+        try:
+            os.remove(claim_path)
+        except FileNotFoundError:
+            pass  # Re-queued while we were running; the result is already written
+        completed += 1
+
+    debug_print(f"Worker {worker_id} completed {completed} shards", DebugLevel.INFO, "costs")
+    return completed
+
+def get_queue_status(queue_dir: str) -> Dict[str, int]:
+    """Count pending, claimed and completed shards of the current run"""
+    manifest_path = os.path.join(queue_dir, MANIFEST_FILE)
+    result_suffix = f".{_read_json(manifest_path)['run_id']}.json" if os.path.exists(manifest_path) else ".json"
+    return {
+        status: sum(name.endswith(suffix) for name in os.listdir(os.path.join(queue_dir, subdir)))
+        for status, subdir, suffix in (
+            ("pending", PENDING_DIR, ".json"),
+            ("claimed", CLAIMED_DIR, ".json"),
+            ("completed", RESULTS_DIR, result_suffix)
+        )
+    }
+
+def merge_results(queue_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Merge per-shard results into the final portfolio summary.
+
+    The summary is also written to summary.json in the queue directory.
+
+    Returns:
+        Summary with portfolio totals and per-ZIP breakdown, or None if any
+        shard in the manifest has no readable result for this run yet or a
+        result does not match the manifest.
+    """
+    manifest = _read_json(os.path.join(queue_dir, MANIFEST_FILE))
+    shard_results = {
+        shard_name: _read_result(queue_dir, shard_name, manifest["run_id"]) for shard_name in manifest["shards"]
+    }
+    missing = [shard_name for shard_name, shard_result in shard_results.items() if shard_result is None]
+    if missing:
+        debug_print(f"Cannot merge: {len(missing)} shards have no results", DebugLevel.ERROR, "costs")
+        return None
+
+    for shard_name, shard_result in shard_results.items():
+        home_ids = [result["home_id"] for result in shard_result["results"]]
+        if shard_result.get("run_id") != manifest["run_id"] or home_ids != manifest["shard_homes"][shard_name]:
+            debug_print(f"Cannot merge: results for shard {shard_name} are from another run", DebugLevel.ERROR, "costs")
+            return None
+
+    totals = {"heating_cost": 0.0, "cooling_cost": 0.0, "total_cost": 0.0}
+    by_zip: Dict[str, Dict[str, float]] = {}
+    failed: List[Tuple[str, str]] = []
+    n_scored = 0
+    for shard_result in shard_results.values():
+        for result in shard_result["results"]:
+            if "error" in result:
+                failed.append((result["home_id"], result["error"]))
+                continue
+            zip_totals = by_zip.setdefault(result["zip_code"], {"n_homes": 0, "total_cost": 0.0})
+            zip_totals["n_homes"] += 1
+            zip_totals["total_cost"] += result["total_cost"]
+            for name in totals:
+                totals[name] += result[name]
+            n_scored += 1
+
+    summary = {
+        "run_id": manifest["run_id"],
+        "n_homes": manifest["n_homes"],
+        "n_scored": n_scored,
+        "n_failed": len(failed),
+        "failed_homes": [{"home_id": home_id, "error": error} for home_id, error in failed],
+        "totals": totals,
+        "mean_total_cost": totals["total_cost"] / n_scored if n_scored else 0.0,
+        "by_zip": by_zip
+    }
+    _write_json_atomic(os.path.join(queue_dir, SUMMARY_FILE), summary)
+    return summary
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+from config import (
+    BUILDING_DEFAULTS,
+    TEMPERATURE_DEFAULTS,
+    ELECTRICITY_RATE_PER_KWH,
+    GAS_RATE_PER_THERM,
+    get_equipment_spec
+)
+from config.debug_config import debug_print, DebugLevel
+from .energy_model import Building, HeatingSystem, CoolingSystem, calculate_annual_energy
+from .weather import DEFAULT_WEATHER_YEAR, load_hourly_temperatures, get_weather_version
+
+# Constants
+RESULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data/result_cache.sqlite")
+DEFAULT_MAX_ENTRIES = 10000
+MODEL_VERSION = 1  # Bump whenever the simulation physics change
+# Recency counter computed inside SQLite so every process sharing the file agrees
+NEXT_ACCESS_SQL = "SELECT COALESCE(MAX(last_access), 0) + 1 FROM results"
+
+def get_config_version() -> str:
+    """
+    Get a hash of the equipment and tariff tables used by the energy model.
+
+    Returns:
+        Hex digest that changes whenever an equipment spec, utility rate or
+        model version changes.
+    """
+    equipment = {}
+    for system in list(HeatingSystem) + list(CoolingSystem):
+        if system == CoolingSystem.NONE:
+            continue
+        equipment[system.value] = asdict(get_equipment_spec(system.value))
+
+    config = {
+        "model_version": MODEL_VERSION,
+        "equipment": equipment,
+        "tariffs": {
+            "electricity_per_kwh": ELECTRICITY_RATE_PER_KWH,
+            "gas_per_therm": GAS_RATE_PER_THERM
+        },
+        "width_to_length_ratio": BUILDING_DEFAULTS["width_to_length_ratio"]
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+def make_cache_key(
+    building: Building,
+    heating_system: Optional[HeatingSystem],
+    cooling_system: Optional[CoolingSystem],
+    indoor_temp_heat: float,
+    indoor_temp_cool: float,
+    weather_version: str,
+    config_version: str
+) -> str:
+    """
+    Build a canonical fingerprint of every input to an annual simulation.
+
+    Numeric fields are normalized to floats so that e.g. 2000 and 2000.0
+    square feet produce the same key.
+
+    Returns:
+        Hex digest identifying the simulation inputs.
+    """
+    fingerprint = {
+        "building": {name: float(value) for name, value in asdict(building).items()},
+        "heating_system": heating_system.value if heating_system else None,
+        "cooling_system": cooling_system.value if cooling_system else None,
+        "setpoints": [float(indoor_temp_heat), float(indoor_temp_cool)],
+        "weather_version": weather_version,
+        "config_version": config_version
+    }
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ResultCache:
+    """
+    SQLite-backed cache of annual simulation results.
+
+    Entries are keyed by make_cache_key(). Entries built with a different
+    config version are dropped when the cache is opened, and entries for a
+    ZIP code are dropped when a result for newer weather data is stored.
+    The least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, path: str = RESULT_CACHE_FILE, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.config_version = get_config_version()
+        self.stats = CacheStats()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                zip_code TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                weather_version TEXT NOT NULL,
+                config_version TEXT NOT NULL,
+                result TEXT NOT NULL,
+                last_access INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_access ON results (last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_zip ON results (zip_code, year)")
+
+        cursor = self._conn.execute("DELETE FROM results WHERE config_version != ?", (self.config_version,))
+        self.stats.invalidations += cursor.rowcount
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result, updating its recency on a hit"""
+        row = self._conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            debug_print(f"Result cache miss: {key[:12]}", DebugLevel.TRACE, "cache")
+            return None
+
+        self._conn.execute(f"UPDATE results SET last_access = ({NEXT_ACCESS_SQL}) WHERE key = ?", (key,))
+        self._conn.commit()
+        self.stats.hits += 1
+        debug_print(f"Result cache hit: {key[:12]}", DebugLevel.TRACE, "cache")
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any], zip_code: str, year: int, weather_version: str) -> None:
+        """Store a result, dropping stale weather entries and evicting beyond max_entries"""
+        cursor = self._conn.execute(
+            "DELETE FROM results WHERE zip_code = ? AND year = ? AND weather_version != ?",
+            (zip_code, year, weather_version)
+        )
+        self.stats.invalidations += cursor.rowcount
+
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ({NEXT_ACCESS_SQL}))",
+            (key, zip_code, year, weather_version, self.config_version, json.dumps(result))
+        )
+
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+            self.stats.evictions += excess
+            debug_print(f"Evicted {excess} result cache entries", DebugLevel.TRACE, "cache")
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached results"""
+        self._conn.execute("DELETE FROM results")
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+def simulate_annual_cached(
+    cache: ResultCache,
+    building: Building,
+    heating_system: Optional[HeatingSystem],
+    cooling_system: Optional[CoolingSystem],
+    zip_code: str,
+    year: int = DEFAULT_WEATHER_YEAR,
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"],
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"],
+    data_dir: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Run calculate_annual_energy() for a ZIP code, serving repeat quotes from the cache.
+
+    Args:
+        cache: Result cache to read from and write to
+        building: Building object
+        heating_system: Type of heating system
+        cooling_system: Type of cooling system
+        zip_code: US ZIP code of the stored weather data
+        year: Year of the stored weather data
+        indoor_temp_heat: Indoor heating setpoint (°F)
+        indoor_temp_cool: Indoor cooling setpoint (°F)
+        data_dir: Optional directory containing the weather CSV files
+
+    Returns:
+        Annual results dictionary, or None if no weather data is stored.
+    """
+    weather_version = get_weather_version(zip_code, year, data_dir)
+    if weather_version is None:
+        debug_print(f"No weather data for ZIP {zip_code}, year {year}", DebugLevel.ERROR, "cache")
+        return None
+
+    key = make_cache_key(
+        building, heating_system, cooling_system,
+        indoor_temp_heat, indoor_temp_cool,
+        weather_version, cache.config_version
+    )
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    hourly_temps = load_hourly_temperatures(zip_code, year, data_dir)
+    result = calculate_annual_energy(
+        building, heating_system, cooling_system, hourly_temps,
+        indoor_temp_heat, indoor_temp_cool
+    )
+    cache.put(key, result, zip_code, year, weather_version)
+    return result
@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from config import BUILDING_DEFAULTS, BUILDING_UNCERTAINTY, TEMPERATURE_DEFAULTS
+from config.debug_config import debug_print, debug_json, DebugLevel
+from .energy_model import HeatingSystem, CoolingSystem, calculate_energy_per_btu, create_building_from_onboarding
+from .weather import DEFAULT_WEATHER_YEAR, load_hourly_temperatures
+
+# Constants
+DEFAULT_SAMPLES = 5000
+DEFAULT_SEED = 20240101  # Fixed so repeated quotes for the same home are stable
+PERCENTILES = {"p10": 10, "p50": 50, "p90": 90}
+
+@dataclass
+class PlanScenario:
+    name: str
+    heating_system: Optional[HeatingSystem]
+    cooling_system: Optional[CoolingSystem]
+    indoor_temp_heat: float = TEMPERATURE_DEFAULTS["heating_setpoint_f"]
+    indoor_temp_cool: float = TEMPERATURE_DEFAULTS["cooling_setpoint_f"]
+    r_value: Optional[float] = None  # Overrides the sampled value, e.g. for an insulation upgrade
+    ach: Optional[float] = None  # Overrides the sampled value, e.g. for air sealing
+
+def sample_building_parameters(
+    square_footage: float,
+    n_samples: int = DEFAULT_SAMPLES,
+    seed: int = DEFAULT_SEED
+) -> Dict[str, np.ndarray]:
+    """
+    Sample plausible building parameter sets for a home of known size.
+
+    Args:
+        square_footage: Conditioned floor area (sq ft)
+        n_samples: Number of parameter sets to draw
+        seed: Random seed, shared across scenarios as common random numbers
+
+    Returns:
+        Dictionary of arrays keyed by Building field name.
+    """
+    rng = np.random.default_rng(seed)
+    floors = list(BUILDING_UNCERTAINTY["floor_weights"])
+    weights = np.array(list(BUILDING_UNCERTAINTY["floor_weights"].values()), dtype=float)
+
+    return {
+        "square_footage": np.full(n_samples, float(square_footage)),
+        "num_floors": rng.choice(floors, size=n_samples, p=weights / weights.sum()),
+        "ceiling_height": rng.triangular(*BUILDING_UNCERTAINTY["ceiling_height_ft"], size=n_samples),
+        "r_value": rng.triangular(*BUILDING_UNCERTAINTY["r_value"], size=n_samples),
+        "ach": rng.triangular(*BUILDING_UNCERTAINTY["ach"], size=n_samples),
+    }
+
+def calculate_load_coefficients(
+    square_footage: np.ndarray,
+    num_floors: np.ndarray,
+    ceiling_height: np.ndarray,
+    r_value: np.ndarray,
+    ach: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized Building.load_coefficient for arrays of building parameters.
+
+    Returns:
+        Array of heat loss coefficients (UA) in BTU/h per °F
+    """
+    ratio = BUILDING_DEFAULTS["width_to_length_ratio"]
+    length = np.sqrt(square_footage / num_floors * ratio)
+    width = length / ratio
+    height = ceiling_height * num_floors
+    surface_area = 2 * (length * width + length * height + width * height)
+    volume = square_footage * ceiling_height * num_floors
+    return surface_area / r_value + 1.08 * ach * volume
+
+def _bands(values: np.ndarray) -> Dict[str, float]:
+    return {name: float(v) for name, v in zip(PERCENTILES, np.percentile(values, list(PERCENTILES.values())))}
+
+def estimate_cost_bands(
+    square_footage: float,
+    scenarios: List[PlanScenario],
+    hourly_temps: Sequence[float],
+    n_samples: int = DEFAULT_SAMPLES,
+    seed: int = DEFAULT_SEED
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Estimate P10/P50/P90 annual costs for each plan scenario in one batched pass.
+
+    Every scenario is evaluated on the same sampled buildings, so savings
+    relative to the first scenario are computed per sample and stay stable.
+
+    Args:
+        square_footage: Conditioned floor area (sq ft)
+        scenarios: Plans to compare; the first one is the savings baseline
+        hourly_temps: Outdoor temperatures (°F), one per hour
+        n_samples: Number of sampled buildings
+        seed: Random seed for the sampled buildings
+
+    Returns:
+        Dictionary keyed by scenario name with heating_cost, cooling_cost,
+        total_cost and savings bands, each a dict of p10/p50/p90.
+    """
+    if not scenarios:
+        raise ValueError("At least one scenario is required")
+    names = [scenario.name for scenario in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Scenario names must be unique, got {names}")
+
+    temps = np.asarray(hourly_temps, dtype=float)
+    params = sample_building_parameters(square_footage, n_samples, seed)
+
+    results = {}
+    baseline_total = None
+    for scenario in scenarios:
+        scenario_params = dict(params)
+        if scenario.r_value is not None:
+            scenario_params["r_value"] = np.full(n_samples, float(scenario.r_value))
+        if scenario.ach is not None:
+            scenario_params["ach"] = np.full(n_samples, float(scenario.ach))
+        load_coefficients = calculate_load_coefficients(**scenario_params)
+
+        heating_degree_hours = np.clip(scenario.indoor_temp_heat - temps, 0, None).sum()
+        cooling_degree_hours = np.clip(temps - scenario.indoor_temp_cool, 0, None).sum()
+
+        heating_cost = load_coefficients * heating_degree_hours * calculate_energy_per_btu(
+            scenario.heating_system, scenario.cooling_system, "heating"
+        )["energy_cost"]
+        cooling_cost = load_coefficients * cooling_degree_hours * calculate_energy_per_btu(
+            scenario.heating_system, scenario.cooling_system, "cooling"
+        )["energy_cost"]
+        total_cost = heating_cost + cooling_cost
+        if baseline_total is None:
+            baseline_total = total_cost
+
+        results[scenario.name] = {
+            "heating_cost": _bands(heating_cost),
+            "cooling_cost": _bands(cooling_cost),
+            "total_cost": _bands(total_cost),
+            "savings": _bands(baseline_total - total_cost)
+        }
+
+    debug_json(results, DebugLevel.DEBUG, "costs")
+    return results
+
+def estimate_onboarding_uncertainty(
+    square_footage: float,
+    primary_heating: str,
+    primary_cooling: str,
+    zip_code: str,
+    scenarios: Optional[List[PlanScenario]] = None,
+    year: int = DEFAULT_WEATHER_YEAR,
+    n_samples: int = DEFAULT_SAMPLES,
+    seed: int = DEFAULT_SEED,
+    data_dir: Optional[str] = None
+) -> Optional[Dict[str, Dict[str, Dict[str, float]]]]:
+    """
+    Uncertainty mode for onboarding estimates.
+
+    The onboarding inputs become the "current" scenario, followed by any
+    additional plan scenarios. See estimate_cost_bands() for the result shape.
+
+    Returns:
+        Cost bands per scenario, or None if no weather data is stored for the ZIP.
+    """
+    building, heating_system, cooling_system = create_building_from_onboarding(
+        square_footage, primary_heating, primary_cooling
+    )
+    hourly_temps = load_hourly_temperatures(zip_code, year, data_dir)
+    if hourly_temps is None:
+        return None
+
+    debug_print(f"Sampling {n_samples} buildings for ZIP {zip_code}", DebugLevel.DEBUG, "costs")
+    current = PlanScenario("current", heating_system, cooling_system)
+    return estimate_cost_bands(
+        building.square_footage, [current] + list(scenarios or []), hourly_temps, n_samples, seed
+    )
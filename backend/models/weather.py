@@ -1,7 +1,8 @@
+import hashlib
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import requests
 import pandas as pd
 import pgeocode
@@ -9,7 +10,16 @@ from config.debug_config import debug_print, DebugLevel
 
 # Constants
 WEATHER_DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data/weather_data.json")
+WEATHER_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 OPEN_METEO_API = "https://archive-api.open-meteo.com/v1/archive"
+DEFAULT_WEATHER_YEAR = 2024
+WEATHER_VERSION_SUFFIX = ".sha256"
+# Coarsest mtime resolution we expect (FAT); a CSV modified within this long
+# of being hashed may have been rewritten without its mtime changing
+WEATHER_MTIME_GRANULARITY_NS = 2_000_000_000
+
+# In-process memo of weather versions: csv path -> (size/mtime signature, digest, hashed at)
+_weather_versions: Dict[str, Tuple[str, str, int]] = {}
 
 def get_coordinates(zip_code: str) -> Optional[Dict[str, float]]:
     """
@@ -143,4 +153,121 @@ def save_weather_to_csv(zip_code: str, year: int, output_dir: Optional[str] = No
         return csv_path
     except Exception as e:
         debug_print(f"Error saving CSV file: {str(e)}", DebugLevel.ERROR, "weather")
-        return ""
\ No newline at end of file
+        return ""
+
+def get_weather_csv_path(zip_code: str, year: int = DEFAULT_WEATHER_YEAR, data_dir: Optional[str] = None) -> str:
+    """Get the path of the stored hourly weather CSV for a ZIP code and year"""
+    return os.path.join(data_dir or WEATHER_DATA_DIR, f"weather_{zip_code}_{year}.csv")
+
+def list_weather_zip_codes(year: int = DEFAULT_WEATHER_YEAR, data_dir: Optional[str] = None) -> List[str]:
+    """List the ZIP codes with stored hourly weather for a year"""
+    suffix = f"_{year}.csv"
+    zip_codes = [
+        filename[len("weather_"):-len(suffix)]
+        for filename in os.listdir(data_dir or WEATHER_DATA_DIR)
+        if filename.startswith("weather_") and filename.endswith(suffix)
+    ]
+    return sorted(zip_codes)
+
+def load_hourly_weather(
+    zip_code: str,
+    year: int = DEFAULT_WEATHER_YEAR,
+    data_dir: Optional[str] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Load stored hourly weather for a ZIP code and year.
+    
+    Args:
+        zip_code: US ZIP code
+        year: Year of the weather data
+        data_dir: Optional directory containing the weather CSV files
+        
+    Returns:
+        DataFrame with datetime and temperature (°F) columns, or None if no data is stored.
+    """
+    csv_path = get_weather_csv_path(zip_code, year, data_dir)
+    if not os.path.exists(csv_path):
+        debug_print(f"No stored weather data for ZIP {zip_code}, year {year}", DebugLevel.ERROR, "weather")
+        return None
+    
+    df = pd.read_csv(csv_path, parse_dates=["datetime"])
+    df["temperature"] = df["temperature"].astype(float)
+    return df
+
+def load_hourly_temperatures(
+    zip_code: str,
+    year: int = DEFAULT_WEATHER_YEAR,
+    data_dir: Optional[str] = None
+) -> Optional[List[float]]:
+    """
+    Load stored hourly temperatures for a ZIP code and year.
+    
+    Args:
+        zip_code: US ZIP code
+        year: Year of the weather data
+        data_dir: Optional directory containing the weather CSV files
+        
+    Returns:
+        List of hourly temperatures (°F), or None if no data is stored.
+    """
+    df = load_hourly_weather(zip_code, year, data_dir)
+    if df is None:
+        return None
+    
+    return df["temperature"].tolist()
+
+def get_weather_version(
+    zip_code: str,
+    year: int = DEFAULT_WEATHER_YEAR,
+    data_dir: Optional[str] = None
+) -> Optional[str]:
+    """
+    Get a content hash of the stored weather data for a ZIP code and year.
+    
+    The version changes whenever the stored CSV is re-fetched or edited, so it
+    can be used to invalidate results derived from the weather data. The hash
+    is stored next to the CSV together with the file's size and mtime, and is
+    only recomputed when those change. Size and mtime are only trusted once
+    the CSV was last modified well before it was hashed, so a same-size
+    rewrite within one mtime tick of the previous write is still detected.
+    
+    Args:
+        zip_code: US ZIP code
+        year: Year of the weather data
+        data_dir: Optional directory containing the weather CSV files
+        
+    Returns:
+        Hex digest of the CSV contents, or None if no data is stored.
+    """
+    csv_path = get_weather_csv_path(zip_code, year, data_dir)
+    try:
+        stat = os.stat(csv_path)
+    except FileNotFoundError:
+        return None
+    signature = f"{stat.st_size} {stat.st_mtime_ns}"
+    
+    cached = _weather_versions.get(csv_path)
+    if cached and cached[0] == signature and stat.st_mtime_ns + WEATHER_MTIME_GRANULARITY_NS < cached[2]:
+        return cached[1]
+    
+    version_path = f"{csv_path}{WEATHER_VERSION_SUFFIX}"
+    try:
+        with open(version_path) as f:
+            stored_signature, _, digest = f.read().strip().rpartition(" ")
+        hashed_at = os.stat(version_path).st_mtime_ns
+    except OSError:
+        stored_signature, digest, hashed_at = "", "", 0
+    
+    if stored_signature != signature or stat.st_mtime_ns + WEATHER_MTIME_GRANULARITY_NS >= hashed_at:
+        with open(csv_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        try:
+            with open(version_path, "w") as f:
+                f.write(f"{signature} {digest}\n")
+            hashed_at = os.stat(version_path).st_mtime_ns
+        except OSError as e:
+            hashed_at = 0
+            debug_print(f"Could not store weather version: {str(e)}", DebugLevel.DEBUG, "weather")
+    
+    _weather_versions[csv_path] = (signature, digest, hashed_at)
+    return digest
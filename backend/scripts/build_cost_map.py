@@ -0,0 +1,20 @@
+import os
+import sys
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from models.cost_map import COST_MAP_FILE, CostMap, build_cost_map
+
+def main():
+    print("Building ZIP cost map...")
+    counts = build_cost_map()
+    print(f"Rebuilt {counts['rebuilt']} ZIP codes, reused {counts['reused']}, removed {counts['removed']}")
+    
+    cost_map = CostMap(COST_MAP_FILE)
+    for zip_code in cost_map.zip_codes:
+        costs = cost_map.lookup(zip_code)
+        print(f"  {zip_code}: ${costs['heating_cost']:,.0f} heating, ${costs['cooling_cost']:,.0f} cooling (2,000 sq ft, Furnace + Central AC)")
+
+if __name__ == "__main__":
+    main()
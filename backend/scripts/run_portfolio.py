@@ -0,0 +1,55 @@
+import argparse
+import json
+import os
+import sys
+import pandas as pd
+
+# Add the parent directory to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from models.job_queue import (
+    DEFAULT_HOMES_PER_SHARD,
+    DEFAULT_STALE_AFTER_S,
+    PortfolioHome,
+    create_shards,
+    run_worker,
+    get_queue_status,
+    merge_results
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a portfolio of homes across any number of workers")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    shard_parser = subparsers.add_parser("shard", help="Split a portfolio CSV into shards")
+    shard_parser.add_argument("portfolio_csv", help="CSV with home_id, zip_code, square_footage, primary_heating, primary_cooling")
+    shard_parser.add_argument("queue_dir")
+    shard_parser.add_argument("--homes-per-shard", type=int, default=DEFAULT_HOMES_PER_SHARD)
+    shard_parser.add_argument("--overwrite", action="store_true", help="Delete an earlier run in queue_dir")
+
+    worker_parser = subparsers.add_parser("worker", help="Claim and run shards until the queue is drained")
+    worker_parser.add_argument("queue_dir")
+    worker_parser.add_argument("--worker-id")
+    worker_parser.add_argument("--stale-after", type=float, default=DEFAULT_STALE_AFTER_S)
+
+    merge_parser = subparsers.add_parser("merge", help="Merge shard results into summary.json")
+    merge_parser.add_argument("queue_dir")
+
+    args = parser.parse_args()
+    if args.command == "shard":
+        df = pd.read_csv(args.portfolio_csv, dtype={"home_id": str, "zip_code": str}).fillna("")
+        homes = [PortfolioHome(**row) for row in df.to_dict("records")]
+        shards = create_shards(homes, args.queue_dir, args.homes_per_shard, args.overwrite)
+        print(f"Created {len(shards)} shards for {len(homes)} homes in {args.queue_dir}")
+    elif args.command == "worker":
+        completed = run_worker(args.queue_dir, args.worker_id, args.stale_after)
+        print(f"Completed {completed} shards")
+    else:
+        summary = merge_results(args.queue_dir)
+        if summary is None:
+            print(f"Queue not finished: {get_queue_status(args.queue_dir)}")
+            sys.exit(1)
+        print(json.dumps({name: summary[name] for name in ("n_homes", "n_scored", "n_failed", "totals")}, indent=2))
+
+if __name__ == "__main__":
+    main()
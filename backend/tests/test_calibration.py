@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from ..models.energy_model import Building, HeatingSystem, CoolingSystem, calculate_energy_per_btu
+from ..models.weather import load_hourly_weather
+from ..models.calibration import UtilityAccount, calculate_monthly_degree_hours, calibrate_accounts
+
+class TestCalibration(unittest.TestCase):
+    def setUp(self):
+        self.heating_dh, self.cooling_dh, self.hours = calculate_monthly_degree_hours(load_hourly_weather("84129"))
+
+    def make_account(self, building, heating_system, cooling_system, base_kwh=0.8, base_therm=0.02):
+        """Generate monthly bills from the energy model for a known building"""
+        heating_load = building.load_coefficient * self.heating_dh
+        cooling_load = building.load_coefficient * self.cooling_dh
+        heating = calculate_energy_per_btu(heating_system, cooling_system, "heating")
+        cooling = calculate_energy_per_btu(heating_system, cooling_system, "cooling")
+        monthly_kwh = (heating_load * heating["energy_consumption_kwh"]
+                       + cooling_load * cooling["energy_consumption_kwh"] + base_kwh * self.hours)
+        monthly_therm = heating_load * heating["gas_consumption_therm"] + base_therm * self.hours
+        return UtilityAccount("84129", building.square_footage, heating_system, cooling_system,
+                              list(monthly_kwh), list(monthly_therm))
+
+    def test_monthly_degree_hours(self):
+        """Monthly degree-hours cover the full year and peak in the right season"""
+        self.assertEqual(self.hours.sum(), 8784)  # 2024 is a leap year
+        self.assertEqual(np.argmax(self.heating_dh), 0)  # January
+        self.assertIn(np.argmax(self.cooling_dh), (6, 7))  # July or August
+
+    def test_recovers_known_buildings(self):
+        """Bills generated by the model calibrate back to the same load coefficient"""
+        buildings = [
+            Building(square_footage=2000, r_value=19.0, ach=0.5),
+            Building(square_footage=1200, r_value=8.0, ach=1.5),
+        ]
+        accounts = [
+            self.make_account(buildings[0], HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC),
+            self.make_account(buildings[1], HeatingSystem.ELECTRIC_RESISTANCE, CoolingSystem.NONE, base_therm=0),
+        ]
+        results = calibrate_accounts(accounts)
+
+        for building, result in zip(buildings, results):
+            self.assertAlmostEqual(result.load_coefficient / building.load_coefficient, 1.0, places=6)
+            self.assertAlmostEqual(result.building.load_coefficient / building.load_coefficient, 1.0, places=6)
+            self.assertAlmostEqual(result.base_kwh_per_hour, 0.8, places=6)
+        self.assertAlmostEqual(results[0].base_therm_per_hour, 0.02, places=6)
+
+    def test_batch_order_and_missing_weather(self):
+        """Results keep input order and unknown ZIP codes return None"""
+        account = self.make_account(Building(square_footage=2000), HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC)
+        missing = UtilityAccount("00000", 2000, HeatingSystem.GAS_FURNACE, None, [100] * 12, [50] * 12)
+        results = calibrate_accounts([missing, account, missing])
+        self.assertIsNone(results[0])
+        self.assertIsNone(results[2])
+        self.assertAlmostEqual(results[1].building.load_coefficient, Building(square_footage=2000).load_coefficient, places=3)
+
+    def test_malformed_bills(self):
+        """Accounts without 12 monthly bills return None without failing the batch"""
+        account = self.make_account(Building(square_footage=2000), HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC)
+        short = UtilityAccount("84129", 2000, HeatingSystem.GAS_FURNACE, None, [100] * 11, [50] * 12)
+        missing = UtilityAccount("00000", 2000, HeatingSystem.GAS_FURNACE, None, [100] * 12, [50] * 13)
+        results = calibrate_accounts([short, account, missing])
+        self.assertIsNone(results[0])
+        self.assertIsNotNone(results[1])
+        self.assertIsNone(results[2])
+
+    def test_no_weather_driven_load(self):
+        """Accounts without heating or cooling cannot be calibrated"""
+        account = UtilityAccount("84129", 2000, None, None, [500] * 12, [20] * 12)
+        self.assertEqual(calibrate_accounts([account]), [None])
+
+if __name__ == '__main__':
+    unittest.main()
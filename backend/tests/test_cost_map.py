@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..models.energy_model import Building, HeatingSystem, CoolingSystem, calculate_annual_energy, create_building_from_onboarding
+from .weather_fixtures import write_weather_csv
+from ..models.cost_map import CostMap, build_cost_map, default_archetypes
+
+class TestCostMap(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "cost_map.bin")
+        self.weather = {"84129": [20.0, 40.0, 60.0, 80.0], "29073": [45.0, 60.0, 85.0, 95.0]}
+        for zip_code, temps in self.weather.items():
+            write_weather_csv(self.tmp_dir, zip_code, temps)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def build(self, **kwargs):
+        return build_cost_map(self.path, data_dir=self.tmp_dir, **kwargs)
+
+    def test_lookup_matches_energy_model(self):
+        """Map costs equal a direct annual simulation of the archetype"""
+        self.assertEqual(self.build(), {"rebuilt": 2, "reused": 0, "removed": 0})
+        cost_map = CostMap(self.path)
+        self.assertEqual(len(cost_map), 2)
+        self.assertEqual(len(cost_map.archetype_keys), len(default_archetypes()))
+
+        expected = calculate_annual_energy(
+            Building(square_footage=1500), HeatingSystem.ELECTRIC_RESISTANCE, CoolingSystem.CENTRAL_AC,
+            self.weather["84129"]
+        )
+        costs = cost_map.lookup("84129", 1600, HeatingSystem.ELECTRIC_RESISTANCE, CoolingSystem.CENTRAL_AC)
+        self.assertAlmostEqual(costs["heating_cost"] / expected["heating_cost"], 1.0, places=5)
+        self.assertAlmostEqual(costs["cooling_cost"] / expected["cooling_cost"], 1.0, places=5)
+        self.assertIsNone(cost_map.lookup("00000"))
+
+    def test_lookup_onboarding_systems(self):
+        """Systems from onboarding answers map onto archetypes or return None"""
+        self.build()
+        cost_map = CostMap(self.path)
+
+        _, heating_system, cooling_system = create_building_from_onboarding(2000, "Furnace", "")
+        self.assertIsNone(cooling_system)
+        self.assertEqual(
+            cost_map.lookup("84129", 2000, heating_system, cooling_system),
+            cost_map.lookup("84129", 2000, HeatingSystem.GAS_FURNACE, CoolingSystem.NONE)
+        )
+
+        _, heating_system, cooling_system = create_building_from_onboarding(2000, "Heat Pump", "Central AC")
+        self.assertIsNone(heating_system)
+        self.assertIsNone(cost_map.lookup("84129", 2000, heating_system, cooling_system))
+
+    def test_incremental_rebuild(self):
+        """Only ZIP codes whose weather changed are recomputed"""
+        self.build()
+        write_weather_csv(self.tmp_dir, "84129", [10.0, 40.0, 60.0, 80.0])
+        os.remove(os.path.join(self.tmp_dir, "weather_29073_2024.csv"))
+        write_weather_csv(self.tmp_dir, "84060", [30.0, 50.0, 70.0, 90.0])
+
+        self.assertEqual(self.build(), {"rebuilt": 2, "reused": 0, "removed": 1})
+        self.assertEqual(self.build(), {"rebuilt": 0, "reused": 2, "removed": 0})
+        cost_map = CostMap(self.path)
+        self.assertNotIn("29073", cost_map)
+        self.assertIn("84060", cost_map)
+
+    def test_config_change_rebuilds_all(self):
+        """Changing the archetype grid or setpoints invalidates every row"""
+        self.build()
+        self.assertEqual(self.build(indoor_temp_heat=70)["rebuilt"], 2)
+        self.assertEqual(self.build(indoor_temp_heat=70)["reused"], 2)
+
+    def test_written_atomically(self):
+        """The map is written via a unique temp file with the usual permissions"""
+        umask = os.umask(0o022)
+        try:
+            self.build()
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+        self.assertFalse([name for name in os.listdir(self.tmp_dir) if name.endswith(".tmp")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from ..models.energy_model import Building, HeatingSystem, CoolingSystem, calculate_load, calculate_energy_consumption
+from ..models.energy_model import Building, HeatingSystem, CoolingSystem, calculate_load, calculate_energy_consumption, calculate_annual_energy
 from ..config.config import DESIGN_TEMPERATURES
 
 class TestEnergyModel(unittest.TestCase):
@@ -71,5 +71,34 @@ class TestEnergyModel(unittest.TestCase):
         self.assertTrue(results["energy_consumption_kwh"] > 0)
         self.assertEqual(results["gas_consumption_therm"], 0)  # Should be 0 for electric
 
+    def test_annual_matches_hourly(self):
+        """Test annual totals equal the sum of hourly heating/cooling results"""
+        hourly_temps = [40, 60, 70, 73, 85, 95]
+        annual = calculate_annual_energy(
+            self.building,
+            HeatingSystem.GAS_FURNACE,
+            CoolingSystem.CENTRAL_AC,
+            hourly_temps,
+            indoor_temp_heat=68,
+            indoor_temp_cool=75
+        )
+        
+        self.assertEqual(annual["heating_degree_hours"], 28 + 8)
+        self.assertEqual(annual["cooling_degree_hours"], 10 + 20)
+        
+        expected_therms = sum(
+            calculate_energy_consumption(self.building, HeatingSystem.GAS_FURNACE, None,
+                                         indoor_temp_heat=68, outdoor_temp=t, mode="heating")["gas_consumption_therm"]
+            for t in (40, 60)
+        )
+        expected_kwh = sum(
+            calculate_energy_consumption(self.building, None, CoolingSystem.CENTRAL_AC,
+                                         indoor_temp_cool=75, outdoor_temp=t, mode="cooling")["energy_consumption_kwh"]
+            for t in (85, 95)
+        )
+        self.assertAlmostEqual(annual["heating_therm"], expected_therms, places=4)
+        self.assertAlmostEqual(annual["cooling_kwh"], expected_kwh, places=4)
+        self.assertAlmostEqual(annual["total_cost"], annual["heating_cost"] + annual["cooling_cost"], places=4)
+
 if __name__ == '__main__':
     unittest.main()
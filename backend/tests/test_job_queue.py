@@ -0,0 +1,172 @@
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from ..models.energy_model import create_building_from_onboarding, calculate_annual_energy
+from ..models.weather import load_hourly_temperatures
+from ..models.job_queue import (
+    PortfolioHome,
+    create_shards,
+    claim_shard,
+    reclaim_stale_shards,
+    run_worker,
+    get_queue_status,
+    merge_results
+)
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue_dir = tempfile.mkdtemp()
+        self.homes = [
+            PortfolioHome(f"home-{i}", zip_code, 1000 + 100 * i, heating, "Central AC")
+            for i, (zip_code, heating) in enumerate(
+                [("84129", "Furnace"), ("29073", "Electric Baseboard")] * 10 + [("00000", "Furnace")]
+            )
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.queue_dir)
+
+    def result_path(self, shard_name):
+        with open(os.path.join(self.queue_dir, "manifest.json")) as f:
+            run_id = json.load(f)["run_id"]
+        return os.path.join(self.queue_dir, "results", f"{shard_name}.{run_id}.json")
+
+    def expected_total(self):
+        total = 0.0
+        for home in self.homes:
+            hourly_temps = load_hourly_temperatures(home.zip_code)
+            if hourly_temps is None:
+                continue
+            building, heating_system, cooling_system = create_building_from_onboarding(
+                home.square_footage, home.primary_heating, home.primary_cooling
+            )
+            total += calculate_annual_energy(building, heating_system, cooling_system, hourly_temps)["total_cost"]
+        return total
+
+    def test_shards_keyed_by_zip(self):
+        """Each shard holds homes from one ZIP code, split by size"""
+        shards = create_shards(self.homes, self.queue_dir, homes_per_shard=4)
+        self.assertEqual(shards, ["00000_0000", "29073_0000", "29073_0001", "29073_0002",
+                                  "84129_0000", "84129_0001", "84129_0002"])
+        with open(os.path.join(self.queue_dir, "pending", "29073_0002.json")) as f:
+            shard = json.load(f)
+        self.assertEqual(len(shard["homes"]), 2)
+        self.assertTrue(all(home["zip_code"] == "29073" for home in shard["homes"]))
+
+    def test_claims_are_exclusive(self):
+        """A shard can only be claimed once"""
+        create_shards(self.homes[:1], self.queue_dir)
+        self.assertIsNotNone(claim_shard(self.queue_dir, "a"))
+        self.assertIsNone(claim_shard(self.queue_dir, "b"))
+
+    def test_multiple_processes(self):
+        """Concurrent worker processes score every shard exactly once"""
+        create_shards(self.homes, self.queue_dir, homes_per_shard=2)
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(self.queue_dir, f"worker-{i}"),
+                                    kwargs={"poll_interval_s": 0.05})
+            for i in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            self.assertEqual(worker.exitcode, 0)
+
+        self.assertEqual(get_queue_status(self.queue_dir), {"pending": 0, "claimed": 0, "completed": 11})
+        summary = merge_results(self.queue_dir)
+        self.assertEqual((summary["n_homes"], summary["n_scored"], summary["n_failed"]), (21, 20, 1))
+        self.assertEqual(summary["failed_homes"][0]["home_id"], "home-20")
+        self.assertAlmostEqual(summary["totals"]["total_cost"], self.expected_total(), places=4)
+        self.assertEqual(summary["by_zip"]["84129"]["n_homes"], 10)
+        self.assertTrue(os.path.exists(os.path.join(self.queue_dir, "summary.json")))
+
+    def test_crash_recovery(self):
+        """Stale claims from a crashed worker are re-queued and completed"""
+        create_shards(self.homes, self.queue_dir, homes_per_shard=5)
+        old = time.time() - 120
+        pending_dir = os.path.join(self.queue_dir, "pending")
+        for filename in os.listdir(pending_dir):
+            os.utime(os.path.join(pending_dir, filename), (old, old))
+
+        # Claiming refreshes the heartbeat even though the shard was queued long ago
+        claim_path = claim_shard(self.queue_dir, "crashed")
+        self.assertEqual(reclaim_stale_shards(self.queue_dir, stale_after_s=60), [])
+
+        os.utime(claim_path, (old, old))
+        self.assertIsNone(merge_results(self.queue_dir))
+
+        run_worker(self.queue_dir, "survivor", stale_after_s=60)
+        summary = merge_results(self.queue_dir)
+        self.assertEqual(summary["n_scored"] + summary["n_failed"], len(self.homes))
+        self.assertAlmostEqual(summary["totals"]["total_cost"], self.expected_total(), places=4)
+
+    def test_reused_queue_dir(self):
+        """A second portfolio cannot reuse the first run's results"""
+        create_shards(self.homes, self.queue_dir)
+        run_worker(self.queue_dir, "first")
+        first = merge_results(self.queue_dir)
+
+        other_homes = self.homes[:3]
+        with self.assertRaises(ValueError):
+            create_shards(other_homes, self.queue_dir)
+
+        create_shards(other_homes, self.queue_dir, overwrite=True)
+        self.assertEqual(get_queue_status(self.queue_dir), {"pending": 2, "claimed": 0, "completed": 0})
+        self.assertIsNone(merge_results(self.queue_dir))
+        run_worker(self.queue_dir, "second")
+        second = merge_results(self.queue_dir)
+        self.assertNotEqual(second["run_id"], first["run_id"])
+        self.assertEqual(second["n_scored"], 3)
+
+    def test_merge_rejects_foreign_results(self):
+        """Result files from another run are not merged"""
+        create_shards(self.homes, self.queue_dir, homes_per_shard=5)
+        run_worker(self.queue_dir, "worker")
+        result_path = self.result_path("84129_0000")
+        with open(result_path) as f:
+            shard_result = json.load(f)
+        shard_result["run_id"] = "another-run"
+        with open(result_path, "w") as f:
+            json.dump(shard_result, f)
+        self.assertIsNone(merge_results(self.queue_dir))
+
+    def test_late_worker_from_earlier_run(self):
+        """A worker finishing a shard after the queue was reused does not clobber the new run"""
+        create_shards(self.homes, self.queue_dir, homes_per_shard=5)
+        with open(claim_shard(self.queue_dir, "slow")) as f:
+            old_shard = json.load(f)
+
+        create_shards(self.homes, self.queue_dir, homes_per_shard=5, overwrite=True)
+        run_worker(self.queue_dir, "current")
+        with open(os.path.join(self.queue_dir, "results", f"{old_shard['shard']}.{old_shard['run_id']}.json"), "w") as f:
+            json.dump({"run_id": old_shard["run_id"], "shard": old_shard["shard"], "worker_id": "slow", "results": []}, f)
+
+        self.assertEqual(get_queue_status(self.queue_dir)["completed"], 5)
+        summary = merge_results(self.queue_dir)
+        self.assertEqual(summary["n_scored"] + summary["n_failed"], len(self.homes))
+
+    def test_unreadable_results(self):
+        """Truncated result files count as missing and their shards are run again"""
+        create_shards(self.homes, self.queue_dir, homes_per_shard=5)
+        claim_path = claim_shard(self.queue_dir, "crashed")
+        shard_name = os.path.basename(claim_path).split("@")[0]
+        with open(self.result_path(shard_name), "w") as f:
+            f.write('{"run_id": ')
+        old = time.time() - 120
+        os.utime(claim_path, (old, old))
+
+        self.assertEqual(reclaim_stale_shards(self.queue_dir, stale_after_s=60), [shard_name])
+        run_worker(self.queue_dir, "survivor")
+        self.assertIsNotNone(merge_results(self.queue_dir))
+
+        with open(self.result_path(shard_name), "w") as f:
+            f.write('{"run_id": ')
+        self.assertIsNone(merge_results(self.queue_dir))
+
+if __name__ == '__main__':
+    unittest.main()
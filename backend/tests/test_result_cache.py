@@ -0,0 +1,135 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..models.energy_model import Building, HeatingSystem, CoolingSystem, calculate_annual_energy
+from ..models import weather
+from .weather_fixtures import write_weather_csv
+from ..models.result_cache import ResultCache, CacheStats, make_cache_key, simulate_annual_cached
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, "cache.sqlite")
+        self.cache = ResultCache(self.cache_path, max_entries=3)
+        self.building = Building(square_footage=2000)
+        write_weather_csv(self.tmp_dir, "84129", [30.0, 50.0, 70.0, 90.0])
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def simulate(self, building=None):
+        return simulate_annual_cached(
+            self.cache, building or self.building,
+            HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC,
+            "84129", data_dir=self.tmp_dir
+        )
+
+    def test_key_is_canonical(self):
+        """Equivalent int and float inputs share a key, other inputs do not"""
+        args = (HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC, 68, 75, "w1", "c1")
+        key = make_cache_key(Building(square_footage=2000), *args)
+        self.assertEqual(key, make_cache_key(Building(square_footage=2000.0), *args))
+        self.assertNotEqual(key, make_cache_key(Building(square_footage=2000, r_value=19.0), *args))
+        self.assertNotEqual(key, make_cache_key(self.building, *args[:-2], "w2", "c1"))
+
+    def test_hit_matches_simulation(self):
+        """Second identical quote is served from the cache"""
+        first = self.simulate()
+        second = self.simulate()
+        self.assertEqual(first, second)
+        self.assertEqual(first, calculate_annual_energy(
+            self.building, HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC, [30.0, 50.0, 70.0, 90.0]
+        ))
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+        self.assertAlmostEqual(self.cache.stats.hit_rate, 0.5)
+
+    def test_weather_change_invalidates(self):
+        """Re-fetched weather produces a miss and drops the stale entry"""
+        first = self.simulate()
+        write_weather_csv(self.tmp_dir, "84129", [20.0, 50.0, 70.0, 95.0])
+        second = self.simulate()
+        self.assertGreater(second["total_cost"], first["total_cost"])
+        self.assertEqual(self.cache.stats.misses, 2)
+        self.assertEqual(self.cache.stats.invalidations, 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted beyond max_entries"""
+        buildings = [Building(square_footage=sqft) for sqft in (1000, 1500, 2000)]
+        for building in buildings:
+            self.simulate(building)
+        self.simulate(buildings[0])  # Refresh the oldest entry
+        self.simulate(Building(square_footage=2500))
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+        self.simulate(buildings[0])
+        self.simulate(buildings[1])
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (2, 5))
+
+    def test_shared_file_recency(self):
+        """Entries used by one process are not evicted as oldest by another"""
+        other = ResultCache(self.cache_path, max_entries=3)
+        try:
+            buildings = [Building(square_footage=sqft) for sqft in (1000, 1500, 2000)]
+            for building in buildings:
+                self.simulate(building)
+            self.cache, mine = other, self.cache
+            self.simulate(buildings[0])  # Other instance uses the oldest entry
+            self.cache = mine
+            self.simulate(Building(square_footage=2500))
+
+            self.cache = other
+            self.simulate(buildings[0])
+            self.assertEqual(other.stats.hits, 2)
+        finally:
+            self.cache = mine
+            other.close()
+
+    def test_persists_across_instances(self):
+        """Results survive reopening the cache file"""
+        self.simulate()
+        self.cache.close()
+        self.cache = ResultCache(self.cache_path, max_entries=3)
+        self.simulate()
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_weather_version_skips_unchanged_files(self):
+        """The CSV is only re-hashed when its size or mtime changes"""
+        csv_path = weather.get_weather_csv_path("84129", data_dir=self.tmp_dir)
+        settled = os.stat(csv_path).st_mtime_ns - 10 * 10**9
+        os.utime(csv_path, ns=(settled, settled))
+        version = weather.get_weather_version("84129", data_dir=self.tmp_dir)
+        version_path = os.path.join(self.tmp_dir, "weather_84129_2024.csv.sha256")
+        with open(version_path) as f:
+            signature = f.read().rpartition(" ")[0]
+        with open(version_path, "w") as f:
+            f.write(f"{signature} stored-digest\n")
+        weather._weather_versions.clear()
+        self.assertEqual(weather.get_weather_version("84129", data_dir=self.tmp_dir), "stored-digest")
+
+        write_weather_csv(self.tmp_dir, "84129", [30.0, 50.0, 70.0, 90.0, 100.0])
+        self.assertNotIn(weather.get_weather_version("84129", data_dir=self.tmp_dir), (version, "stored-digest"))
+
+    def test_weather_version_detects_same_size_rewrite(self):
+        """A rewrite within one mtime tick is detected despite equal size and mtime"""
+        csv_path = weather.get_weather_csv_path("84129", data_dir=self.tmp_dir)
+        mtime = os.stat(csv_path).st_mtime_ns
+        version = weather.get_weather_version("84129", data_dir=self.tmp_dir)
+
+        write_weather_csv(self.tmp_dir, "84129", [30.0, 50.0, 70.0, 80.0])
+        os.utime(csv_path, ns=(mtime, mtime))
+        self.assertNotEqual(weather.get_weather_version("84129", data_dir=self.tmp_dir), version)
+
+    def test_missing_weather(self):
+        """Unknown ZIP codes return None without touching the cache"""
+        result = simulate_annual_cached(
+            self.cache, self.building, HeatingSystem.GAS_FURNACE, None, "00000", data_dir=self.tmp_dir
+        )
+        self.assertIsNone(result)
+        self.assertEqual(self.cache.stats, CacheStats())
+
+if __name__ == '__main__':
+    unittest.main()
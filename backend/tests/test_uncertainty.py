@@ -0,0 +1,74 @@
+import time
+import unittest
+from ..models.energy_model import Building, HeatingSystem, CoolingSystem, calculate_annual_energy
+from ..models.uncertainty import (
+    PlanScenario,
+    sample_building_parameters,
+    calculate_load_coefficients,
+    estimate_cost_bands,
+    estimate_onboarding_uncertainty
+)
+
+class TestUncertainty(unittest.TestCase):
+    def setUp(self):
+        self.hourly_temps = [10.0, 30.0, 50.0, 65.0, 80.0, 95.0] * 100
+        self.current = PlanScenario("current", HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC)
+
+    def test_load_coefficients_match_building(self):
+        """Vectorized UA matches Building.load_coefficient per sample"""
+        params = sample_building_parameters(2000, n_samples=5)
+        coefficients = calculate_load_coefficients(**params)
+        for i in range(5):
+            building = Building(**{name: values[i].item() for name, values in params.items()})
+            self.assertAlmostEqual(coefficients[i], building.load_coefficient, places=6)
+
+    def test_bands_bracket_default_building(self):
+        """P10 <= P50 <= P90 and the default home lies inside the band"""
+        bands = estimate_cost_bands(2000, [self.current], self.hourly_temps)["current"]["total_cost"]
+        default = calculate_annual_energy(
+            Building(square_footage=2000), HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC, self.hourly_temps
+        )
+        self.assertLessEqual(bands["p10"], bands["p50"])
+        self.assertLessEqual(bands["p50"], bands["p90"])
+        self.assertGreater(default["total_cost"], bands["p10"])
+        self.assertLess(default["total_cost"], bands["p90"])
+
+    def test_common_random_numbers(self):
+        """Identical plans have exactly zero savings in every percentile"""
+        same = PlanScenario("same", HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC)
+        upgrade = PlanScenario("upgrade", HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC, indoor_temp_heat=65)
+        results = estimate_cost_bands(2000, [self.current, same, upgrade], self.hourly_temps)
+        self.assertEqual(results["same"]["savings"], {"p10": 0.0, "p50": 0.0, "p90": 0.0})
+        self.assertGreater(results["upgrade"]["savings"]["p10"], 0)
+        self.assertEqual(results, estimate_cost_bands(2000, [self.current, same, upgrade], self.hourly_temps))
+
+    def test_large_batch(self):
+        """Thousands of samples against a full year of weather return bands for every scenario"""
+        scenarios = [self.current] + [
+            PlanScenario(f"setback-{setpoint}", HeatingSystem.GAS_FURNACE, CoolingSystem.CENTRAL_AC,
+                         indoor_temp_heat=setpoint)
+            for setpoint in (64, 65, 66)
+        ]
+        start = time.perf_counter()
+        results = estimate_cost_bands(2000, scenarios, [50.0] * 8784, n_samples=10000)
+        self.assertLess(time.perf_counter() - start, 10.0)  # Loose guard against losing vectorization
+
+        self.assertEqual(list(results), [scenario.name for scenario in scenarios])
+        for bands in results.values():
+            self.assertEqual(set(bands), {"heating_cost", "cooling_cost", "total_cost", "savings"})
+            for band in bands.values():
+                self.assertEqual(list(band), ["p10", "p50", "p90"])
+                self.assertLessEqual(band["p10"], band["p50"])
+                self.assertLessEqual(band["p50"], band["p90"])
+
+    def test_duplicate_scenario_names(self):
+        """Scenarios sharing a name are rejected instead of overwritten"""
+        with self.assertRaises(ValueError):
+            estimate_cost_bands(2000, [self.current, self.current], self.hourly_temps)
+
+    def test_onboarding_missing_weather(self):
+        """Unknown ZIP codes return None"""
+        self.assertIsNone(estimate_onboarding_uncertainty(2000, "Furnace", "Central AC", "00000"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,8 @@
+import os
+
+def write_weather_csv(data_dir, zip_code, temps, year=2024):
+    """Write an hourly weather CSV in the layout save_weather_to_csv produces"""
+    with open(os.path.join(data_dir, f"weather_{zip_code}_{year}.csv"), "w") as f:
+        f.write("datetime,temperature\n")
+        for hour, temp in enumerate(temps):
+            f.write(f"{year}-01-01T{hour:02d}:00,{temp}\n")